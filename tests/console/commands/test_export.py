@@ -1,12 +1,18 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+import copy
+
+from typing import Dict
+
 import pytest
+import tomlkit
 
 from cleo.testers import CommandTester
 
 from poetry.factory import Factory
 from poetry.repositories.pool import Pool
+from poetry.utils.toml_file import TomlFile
 from tests.helpers import get_package
 
 from ..conftest import Application
@@ -47,12 +53,47 @@ bar = { version = "^1.1", optional = true }
 feature_bar = ["bar"]
 """
 
+PYPROJECT_DOCUMENT = tomlkit.parse(PYPROJECT_CONTENT)
+
+# Lock files produced by the lock command, keyed by content hash
+LOCK_CONTENTS = {}  # type: Dict[str, bytes]
+
+FOO = get_package("foo", "1.0.0")
+BAR = get_package("bar", "1.1.0")
+
+EXPECTED_FOO_ONLY = """\
+foo==1.0.0
+"""
+
+EXPECTED_WITH_BAR = """\
+bar==1.1.0
+foo==1.0.0
+"""
+
+
+class ParsedTomlFile(TomlFile):
+    def read(self):
+        if self.path.name == "pyproject.toml":
+            return copy.deepcopy(PYPROJECT_DOCUMENT)
+
+        return super(ParsedTomlFile, self).read()
+
+
+@pytest.fixture(autouse=True)
+def setup_repo(repo):
+    # The solver sets the category, optionality and marker of resolved packages
+    repo.add_package(FOO.clone())
+    repo.add_package(BAR.clone())
+
 
 @pytest.fixture
-def poetry(repo, tmp_dir):
+def poetry(repo, tmp_dir, mocker):
     with (Path(tmp_dir) / "pyproject.toml").open("w", encoding="utf-8") as f:
         f.write(PYPROJECT_CONTENT)
 
+    # The content never changes so there is no need to parse it for every test
+    mocker.patch("poetry.factory.TomlFile", new=ParsedTomlFile)
+
     p = Factory().create_poetry(Path(tmp_dir))
 
     locker = Locker(p.locker.lock.path, p.locker._local_config)
@@ -71,121 +112,57 @@ def app(poetry):
     return Application(poetry)
 
 
-def test_export_exports_requirements_txt_file_locks_if_no_lock_file(app, repo):
-    command = app.find("export")
-    tester = CommandTester(command)
+@pytest.fixture
+def locked(app):
+    locker = app.poetry.locker
+    if locker._content_hash not in LOCK_CONTENTS:
+        CommandTester(app.find("lock")).execute()
 
-    assert not app.poetry.locker.lock.exists()
+        LOCK_CONTENTS[locker._content_hash] = locker.lock.path.read_bytes()
+    else:
+        locker.lock.path.write_bytes(LOCK_CONTENTS[locker._content_hash])
+        locker.locked()
 
-    repo.add_package(get_package("foo", "1.0.0"))
-    repo.add_package(get_package("bar", "1.1.0"))
+
+@pytest.fixture
+def tester(app):
+    return CommandTester(app.find("export"))
+
+
+def test_export_exports_requirements_txt_file_locks_if_no_lock_file(tester, app):
+    assert not app.poetry.locker.lock.exists()
 
     tester.execute("--format requirements.txt --output requirements.txt")
 
     requirements = app.poetry.file.parent / "requirements.txt"
     assert requirements.exists()
-
-    with requirements.open(encoding="utf-8") as f:
-        content = f.read()
-
     assert app.poetry.locker.lock.exists()
 
-    expected = """\
-foo==1.0.0
-"""
-
-    assert expected == content
+    assert EXPECTED_FOO_ONLY == requirements.read_text(encoding="utf-8")
     assert "The lock file does not exist. Locking." in tester.io.fetch_output()
 
 
-def test_export_exports_requirements_txt_uses_lock_file(app, repo):
-    repo.add_package(get_package("foo", "1.0.0"))
-    repo.add_package(get_package("bar", "1.1.0"))
-
-    command = app.find("lock")
-    tester = CommandTester(command)
-    tester.execute()
-
-    assert app.poetry.locker.lock.exists()
-
-    command = app.find("export")
-    tester = CommandTester(command)
-
+def test_export_exports_requirements_txt_uses_lock_file(tester, app, locked):
     tester.execute("--format requirements.txt --output requirements.txt")
 
     requirements = app.poetry.file.parent / "requirements.txt"
     assert requirements.exists()
 
-    with requirements.open(encoding="utf-8") as f:
-        content = f.read()
-
-    assert app.poetry.locker.lock.exists()
-
-    expected = """\
-foo==1.0.0
-"""
-
-    assert expected == content
+    assert EXPECTED_FOO_ONLY == requirements.read_text(encoding="utf-8")
     assert "The lock file does not exist. Locking." not in tester.io.fetch_output()
 
 
-def test_export_fails_on_invalid_format(app, repo):
-    repo.add_package(get_package("foo", "1.0.0"))
-    repo.add_package(get_package("bar", "1.1.0"))
-
-    command = app.find("lock")
-    tester = CommandTester(command)
-    tester.execute()
-
-    assert app.poetry.locker.lock.exists()
-
-    command = app.find("export")
-    tester = CommandTester(command)
-
+def test_export_fails_on_invalid_format(tester, locked):
     with pytest.raises(ValueError):
         tester.execute("--format invalid")
 
 
-def test_export_prints_to_stdout_by_default(app, repo):
-    repo.add_package(get_package("foo", "1.0.0"))
-    repo.add_package(get_package("bar", "1.1.0"))
-
-    command = app.find("lock")
-    tester = CommandTester(command)
-    tester.execute()
-
-    assert app.poetry.locker.lock.exists()
-
-    command = app.find("export")
-    tester = CommandTester(command)
-
-    tester.execute("--format requirements.txt")
-
-    expected = """\
-foo==1.0.0
-"""
-
-    assert expected == tester.io.fetch_output()
-
-
-def test_export_includes_extras_by_flag(app, repo):
-    repo.add_package(get_package("foo", "1.0.0"))
-    repo.add_package(get_package("bar", "1.1.0"))
-
-    command = app.find("lock")
-    tester = CommandTester(command)
-    tester.execute()
-
-    assert app.poetry.locker.lock.exists()
-
-    command = app.find("export")
-    tester = CommandTester(command)
-
-    tester.execute("--format requirements.txt --extras feature_bar")
-
-    expected = """\
-bar==1.1.0
-foo==1.0.0
-"""
+@pytest.mark.parametrize(
+    "options, expected",
+    [("", EXPECTED_FOO_ONLY), ("--extras feature_bar", EXPECTED_WITH_BAR)],
+    ids=["default", "extras"],
+)
+def test_export_prints_to_stdout(tester, locked, options, expected):
+    tester.execute("--format requirements.txt {}".format(options))
 
     assert expected == tester.io.fetch_output()
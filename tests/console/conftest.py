@@ -1,4 +1,5 @@
 import os
+import uuid
 
 import pytest
 
@@ -19,6 +20,21 @@ from tests.helpers import mock_clone
 from tests.helpers import mock_download
 
 
+@pytest.fixture(scope="session")
+def tmp_root(tmpdir_factory):
+    return Path(str(tmpdir_factory.mktemp("console")))
+
+
+@pytest.fixture
+def tmp_dir(tmp_root):
+    # Directories are not removed after the test: they stay under pytest's
+    # basetemp, of which only the last 3 runs are kept.
+    dir_ = tmp_root / uuid.uuid4().hex
+    dir_.mkdir()
+
+    return str(dir_)
+
+
 @pytest.fixture()
 def installer():
     return NoopInstaller()
@@ -1,4 +1,5 @@
-import shutil
+from typing import Dict
+from typing import Optional
 
 import pytest
 
@@ -11,22 +12,25 @@ from poetry.utils._compat import PY35
 from poetry.utils._compat import Path
 
 
-try:
-    import urllib.parse as urlparse
-except ImportError:
-    import urlparse
-
-
 class MockRepository(LegacyRepository):
 
     FIXTURES = Path(__file__).parent / "fixtures" / "legacy"
 
+    _DIST_CACHE = {}  # type: Dict[str, bytes]
+    _PAGE_CACHE = {}  # type: Dict[str, Optional[Page]]
+
     def __init__(self, auth=None):
         super(MockRepository, self).__init__(
             "legacy", url="http://foo.bar", auth=auth, disable_cache=True
         )
 
     def _get(self, endpoint):
+        if endpoint not in self._PAGE_CACHE:
+            self._PAGE_CACHE[endpoint] = self._load_page(endpoint)
+
+        return self._PAGE_CACHE[endpoint]
+
+    def _load_page(self, endpoint):
         parts = endpoint.split("/")
         name = parts[1]
 
@@ -34,14 +38,18 @@ class MockRepository(LegacyRepository):
         if not fixture.exists():
             return
 
-        with fixture.open(encoding="utf-8") as f:
-            return Page(self._url + endpoint, f.read(), {})
+        return Page(self._url + endpoint, fixture.read_bytes().decode("utf-8"), {})
 
     def _download(self, url, dest):
-        filename = urlparse.urlparse(url).path.rsplit("/")[-1]
-        filepath = self.FIXTURES.parent / "pypi.org" / "dists" / filename
+        # Links carry the distribution hash as a fragment
+        path = url.partition("#")[0].partition("?")[0]
+        filename = path.rpartition("/")[2]
+
+        if filename not in self._DIST_CACHE:
+            filepath = self.FIXTURES.parent / "pypi.org" / "dists" / filename
+            self._DIST_CACHE[filename] = filepath.read_bytes()
 
-        shutil.copyfile(str(filepath), dest)
+        Path(dest).write_bytes(self._DIST_CACHE[filename])
 
 
 def test_page_relative_links_path_are_correct():